@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Audit log archiver
+Moves audit_logs rows older than the retention window into monthly,
+compressed, append-only archive files and looks up archived entries
+by patient and date range for compliance requests
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+DB_PATH = "health_admin.db"
+ARCHIVE_DIR = os.path.join("archives", "audit_logs")
+INDEX_FILE = "index.json"
+DEFAULT_HOT_MONTHS = 6
+
+COLUMNS = ["id", "user_id", "patient_id", "action", "resource", "details",
+           "ip_address", "user_agent", "timestamp"]
+
+
+def month_cutoff(hot_months, now=None):
+    """Return the first month (YYYY-MM) that stays in the hot table"""
+    now = now or datetime.now()
+    month_index = now.year * 12 + (now.month - 1) - (hot_months - 1)
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+
+def next_month(month):
+    """Return the month (YYYY-MM) following the given one"""
+    year, mon = int(month[:4]), int(month[5:7])
+    return f"{year + mon // 12:04d}-{mon % 12 + 1:02d}"
+
+
+def load_index(archive_dir):
+    """Load the archive index, or an empty one if none exists yet"""
+    path = os.path.join(archive_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {"files": []}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_index(archive_dir, index):
+    """Atomically replace the archive index"""
+    path = os.path.join(archive_dir, INDEX_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def row_to_record(row):
+    """Convert an audit_logs row to a JSON-serialisable dict"""
+    record = dict(zip(COLUMNS, row))
+    if isinstance(record["details"], str):
+        try:
+            record["details"] = json.loads(record["details"])
+        except ValueError:
+            pass
+    return record
+
+
+def write_archive_file(path, rows):
+    """Write rows as gzip-compressed JSON lines and return the file's sha256"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            for row in rows:
+                f.write((json.dumps(row_to_record(row), default=str) + "\n").encode("utf-8"))
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp_path, path)
+
+    # Verify the file reads back completely before the rows are deleted
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        written = sum(1 for _ in f)
+    if written != len(rows):
+        raise RuntimeError(f"{path}: wrote {written} rows, expected {len(rows)}")
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def archive(conn, archive_dir, hot_months, dry_run=False):
+    """Archive every month older than the retention window"""
+    cursor = conn.cursor()
+    cutoff = month_cutoff(hot_months)
+
+    cursor.execute(
+        "SELECT substr(timestamp, 1, 7) AS month, COUNT(*) FROM audit_logs "
+        "WHERE timestamp < ? GROUP BY month ORDER BY month",
+        (cutoff + "-01",),
+    )
+    months = cursor.fetchall()
+    if not months:
+        print(f"✅ No audit log rows older than {cutoff}")
+        return 0
+
+    os.makedirs(archive_dir, exist_ok=True)
+    index = load_index(archive_dir)
+    indexed_files = {entry["file"] for entry in index["files"]}
+    archived = 0
+
+    for month, count in months:
+        if dry_run:
+            print(f"📦 {month}: {count} rows would be archived")
+            continue
+
+        cursor.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM audit_logs "
+            "WHERE timestamp >= ? AND timestamp < ? ORDER BY id",
+            (month + "-01", next_month(month) + "-01"),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            # Removed since the month list was built, e.g. by a concurrent run
+            print(f"⚠️  {month}: no rows left to archive, skipped")
+            continue
+        ids = [row[0] for row in rows]
+        filename = f"audit_logs_{month}_{ids[0]}-{ids[-1]}.jsonl.gz"
+
+        # A previous run may have written and indexed this file but stopped
+        # before deleting the rows; in that case only the delete is left to do
+        if filename not in indexed_files:
+            sha256 = write_archive_file(os.path.join(archive_dir, filename), rows)
+            timestamps = sorted(str(row[COLUMNS.index("timestamp")]) for row in rows)
+            patient_ids = sorted({row[COLUMNS.index("patient_id")] for row in rows
+                                  if row[COLUMNS.index("patient_id")] is not None})
+            index["files"].append({
+                "file": filename,
+                "month": month,
+                "first_id": ids[0],
+                "last_id": ids[-1],
+                "rows": len(rows),
+                "start": timestamps[0],
+                "end": timestamps[-1],
+                "patient_ids": patient_ids,
+                "sha256": sha256,
+                "archived_at": datetime.now().isoformat(),
+            })
+            save_index(archive_dir, index)
+
+        cursor.execute(
+            "DELETE FROM audit_logs WHERE timestamp >= ? AND timestamp < ? AND id <= ?",
+            (month + "-01", next_month(month) + "-01", ids[-1]),
+        )
+        conn.commit()
+        archived += len(rows)
+        print(f"📦 {month}: archived {len(rows)} rows to {filename}")
+
+    return archived
+
+
+def lookup(conn, archive_dir, patient_id, start, end):
+    """Yield audit entries for a patient in [start, end] from archives and the hot table"""
+    index = load_index(archive_dir)
+    for entry in sorted(index["files"], key=lambda e: e["first_id"]):
+        if patient_id not in entry["patient_ids"]:
+            continue
+        if entry["end"] < start or entry["start"] > end:
+            continue
+        with gzip.open(os.path.join(archive_dir, entry["file"]), "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["patient_id"] == patient_id and start <= str(record["timestamp"]) <= end:
+                    yield record
+
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT {', '.join(COLUMNS)} FROM audit_logs "
+        "WHERE patient_id = ? AND timestamp >= ? AND timestamp <= ? ORDER BY id",
+        (patient_id, start, end),
+    )
+    for row in cursor:
+        yield row_to_record(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old audit logs and look up archived entries")
+    parser.add_argument("--db", default=DB_PATH, help=f"SQLite database path (default: {DB_PATH})")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR, help=f"Archive directory (default: {ARCHIVE_DIR})")
+    parser.add_argument("--hot-months", type=int, default=DEFAULT_HOT_MONTHS,
+                        help=f"Months kept in the audit_logs table (default: {DEFAULT_HOT_MONTHS})")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be archived")
+    parser.add_argument("--lookup", action="store_true", help="Look up entries instead of archiving")
+    parser.add_argument("--patient-id", type=int, help="Patient id for --lookup")
+    parser.add_argument("--start", default="0000-01-01", help="Start date for --lookup (YYYY-MM-DD)")
+    parser.add_argument("--end", default="9999-12-31", help="End date for --lookup (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file '{args.db}' not found!")
+        return False
+    if args.hot_months < 1:
+        print("❌ --hot-months must be at least 1")
+        return False
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.lookup:
+            if args.patient_id is None:
+                print("❌ --lookup requires --patient-id")
+                return False
+            # Include the whole end day when only a date is given
+            end = args.end + " 23:59:59.999999" if len(args.end) == 10 else args.end
+            for record in lookup(conn, args.archive_dir, args.patient_id, args.start, end):
+                print(json.dumps(record, default=str))
+            return True
+
+        print(f"🔍 Archiving audit logs older than {args.hot_months} months...")
+        archived = archive(conn, args.archive_dir, args.hot_months, args.dry_run)
+    except (sqlite3.Error, OSError, RuntimeError) as e:
+        print(f"❌ Error archiving audit logs: {e}")
+        return False
+    finally:
+        conn.close()
+
+    if not args.dry_run:
+        print(f"✅ Archived {archived} rows")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
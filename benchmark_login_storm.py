@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Login storm benchmark
+Measures latency of a non-auth endpoint on its own and while many
+clients log in at once, to show how much password hashing stalls
+other requests
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+# Pause after a failed login so a failing server is not hammered
+FAILURE_BACKOFF = 0.5
+# Stop the phase once this share of at least ABORT_MIN_ATTEMPTS logins failed
+ABORT_FAILURE_RATIO = 0.9
+ABORT_MIN_ATTEMPTS = 20
+
+
+def summarize(latencies):
+    """Return p50/p99/max in milliseconds"""
+    if not latencies:
+        return {"count": 0, "p50": float("nan"), "p99": float("nan"), "max": float("nan")}
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50": statistics.median(ordered) * 1000,
+        "p99": ordered[max(int(len(ordered) * 0.99) - 1, 0)] * 1000,
+        "max": ordered[-1] * 1000,
+    }
+
+
+async def probe(client, base_url, stop, interval):
+    """Request /health at a fixed rate until stopped and collect latencies"""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            await client.get(f"{base_url}/health")
+            latencies.append(time.perf_counter() - started)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def login_loop(client, base_url, credentials, stop, counts):
+    """Log in repeatedly until stopped and collect login latencies"""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            response = await client.post(f"{base_url}/api/auth/login", json=credentials)
+            succeeded = response.status_code == 200
+        except httpx.HTTPError:
+            succeeded = False
+        counts["attempts"] += 1
+        if succeeded:
+            latencies.append(time.perf_counter() - started)
+            continue
+
+        counts["failures"] += 1
+        if (counts["attempts"] >= ABORT_MIN_ATTEMPTS
+                and counts["failures"] >= counts["attempts"] * ABORT_FAILURE_RATIO):
+            # e.g. a rate limit or account lockout kicked in; the latencies
+            # would no longer measure password hashing
+            counts["aborted"] = True
+            stop.set()
+        await asyncio.sleep(FAILURE_BACKOFF)
+    return latencies
+
+
+async def run_phase(base_url, credentials, logins, duration, interval):
+    """Run the probe for duration seconds with the given number of login clients"""
+    stop = asyncio.Event()
+    counts = {"attempts": 0, "failures": 0, "aborted": False}
+    limits = httpx.Limits(max_connections=logins + 2)
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        probe_task = asyncio.create_task(probe(client, base_url, stop, interval))
+        login_tasks = [asyncio.create_task(login_loop(client, base_url, credentials, stop, counts))
+                       for _ in range(logins)]
+        try:
+            # Ends early if the login clients abort the phase
+            await asyncio.wait_for(stop.wait(), timeout=duration)
+        except asyncio.TimeoutError:
+            pass
+        stop.set()
+        probe_latencies = await probe_task
+        login_results = await asyncio.gather(*login_tasks)
+
+    login_latencies = [latency for latencies in login_results for latency in latencies]
+    return summarize(probe_latencies), summarize(login_latencies), counts
+
+
+async def main(args):
+    credentials = {"username": args.username, "password": args.password}
+
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(f"{args.base_url}/api/auth/login", json=credentials)
+    except httpx.ConnectError:
+        print(f"❌ Cannot connect to {args.base_url} - make sure the server is running")
+        return False
+    if response.status_code != 200:
+        print(f"❌ Login failed: {response.status_code} - check the benchmark credentials")
+        return False
+
+    print(f"⚙️  {args.logins} concurrent login clients, {args.duration:.0f}s per phase")
+
+    print("\n1. Baseline (no logins)...")
+    baseline, _, _ = await run_phase(args.base_url, credentials, 0, args.duration, args.interval)
+
+    print("2. Login storm...")
+    storm, logins, counts = await run_phase(args.base_url, credentials, args.logins,
+                                            args.duration, args.interval)
+    if counts["aborted"]:
+        print(f"❌ Login storm aborted: {counts['failures']} of {counts['attempts']} logins failed")
+        print("   Check the server logs for rate limiting or account lockout")
+        return False
+
+    print(f"\n{'Phase':<22} {'requests':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    print("-" * 62)
+    for name, stats in [("/health baseline", baseline), ("/health during storm", storm),
+                        ("logins", logins)]:
+        print(f"{name:<22} {stats['count']:>9} {stats['p50']:>9.1f} {stats['p99']:>9.1f} {stats['max']:>9.1f}")
+
+    print(f"\n🔐 {logins['count'] / args.duration:.1f} logins/s, {counts['failures']} failed")
+    if baseline["count"] and storm["count"]:
+        print(f"📈 /health p99 slowdown during storm: {storm['p99'] / baseline['p99']:.1f}x")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure non-auth latency during a burst of logins")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Server URL (default: {BASE_URL})")
+    parser.add_argument("--username", default=os.getenv("HEALTH_ADMIN_USERNAME", "admin"))
+    parser.add_argument("--password", default=os.getenv("HEALTH_ADMIN_PASSWORD", "admin123"))
+    parser.add_argument("--logins", type=int, default=20, help="Concurrent login clients (default: 20)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase (default: 10)")
+    parser.add_argument("--interval", type=float, default=0.05,
+                        help="Delay between /health probes in seconds (default: 0.05)")
+    args = parser.parse_args()
+
+    print("🏁 Health Admin Login Storm Benchmark")
+    print("=" * 62)
+    sys.exit(0 if asyncio.run(main(args)) else 1)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+SQLite concurrency benchmark
+Compares the default SQLite configuration with the tuned profile (WAL and
+connection pragmas), with and without a single-writer queue, under
+concurrent dashboard-style reads and audit-log writes
+"""
+
+import argparse
+import os
+import queue
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+DB_PATH = "health_admin.db"
+
+TUNED_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+]
+
+READ_QUERIES = [
+    "SELECT COUNT(*) FROM patients WHERE is_active = 1",
+    "SELECT AVG(relationship_score) FROM patients WHERE is_active = 1",
+    "SELECT * FROM audit_logs ORDER BY id DESC LIMIT 10",
+]
+
+WRITE_SQL = ("INSERT INTO audit_logs (user_id, patient_id, action, resource, details, timestamp) "
+             "VALUES (1, 1, 'read', 'patient', '{}', CURRENT_TIMESTAMP)")
+
+
+def connect(path, tuned):
+    """Open a connection using the default or the tuned profile"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    if tuned:
+        for pragma in TUNED_PRAGMAS:
+            conn.execute(pragma)
+    return conn
+
+
+def prepare_database(source, directory, tuned, seed_rows):
+    """Copy the source database and seed it so reads have realistic work"""
+    path = os.path.join(directory, f"bench_{'tuned' if tuned else 'default'}.db")
+    shutil.copyfile(source, path)
+    conn = connect(path, tuned)
+    if not tuned:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    conn.executemany(
+        "INSERT INTO patients (patient_id, encrypted_first_name, encrypted_last_name, "
+        "relationship_score, is_active) VALUES (?, 'x', 'x', 50, 1)",
+        [(f"BENCH{i:07d}",) for i in range(seed_rows // 10)],
+    )
+    conn.executemany(
+        "INSERT INTO audit_logs (user_id, patient_id, action, resource, details) "
+        "VALUES (1, 1, 'read', 'patient', '{}')",
+        [() for _ in range(seed_rows)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+class WriterQueue:
+    """Serialises all writes through one connection on a dedicated thread"""
+
+    def __init__(self, path, tuned, batch_size=100):
+        self.conn = connect(path, tuned)
+        self.queue = queue.Queue()
+        self.batch_size = batch_size
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, sql):
+        request = {"sql": sql, "done": threading.Event(), "error": None}
+        self.queue.put(request)
+        request["done"].wait()
+        if request["error"] is not None:
+            raise request["error"]
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            # Group whatever is already waiting into a single transaction
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.queue.put(None)
+                    break
+                batch.append(item)
+            try:
+                for request in batch:
+                    self.conn.execute(request["sql"])
+                self.conn.commit()
+            except Exception as e:
+                # Hand every error back to the callers; an exception escaping
+                # this thread would leave them waiting forever
+                for request in batch:
+                    request["error"] = e
+                self.conn.rollback()
+            finally:
+                for request in batch:
+                    request["done"].set()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.conn.close()
+
+
+def run_profile(path, tuned, use_writer_queue, readers, writers, duration):
+    """Run the mixed workload and return throughput, latency and error counts"""
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_latencies = []
+    results = {"reads": 0, "writes": 0, "errors": 0}
+    writer_queue = WriterQueue(path, tuned) if use_writer_queue else None
+
+    def reader():
+        conn = connect(path, tuned)
+        latencies = []
+        errors = 0
+        i = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                conn.execute(READ_QUERIES[i % len(READ_QUERIES)]).fetchall()
+                latencies.append(time.perf_counter() - started)
+            except sqlite3.OperationalError:
+                errors += 1
+            i += 1
+        conn.close()
+        with lock:
+            read_latencies.extend(latencies)
+            results["reads"] += len(latencies)
+            results["errors"] += errors
+
+    def writer():
+        conn = None if writer_queue else connect(path, tuned)
+        writes = 0
+        errors = 0
+        while not stop.is_set():
+            try:
+                if writer_queue:
+                    writer_queue.submit(WRITE_SQL)
+                else:
+                    conn.execute(WRITE_SQL)
+                    conn.commit()
+                writes += 1
+            except sqlite3.OperationalError:
+                errors += 1
+                if conn is not None:
+                    conn.rollback()
+        if conn is not None:
+            conn.close()
+        with lock:
+            results["writes"] += writes
+            results["errors"] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    if writer_queue:
+        writer_queue.close()
+
+    read_latencies.sort()
+    if read_latencies:
+        results["read_p50_ms"] = statistics.median(read_latencies) * 1000
+        results["read_p99_ms"] = read_latencies[max(int(len(read_latencies) * 0.99) - 1, 0)] * 1000
+    else:
+        results["read_p50_ms"] = results["read_p99_ms"] = float("nan")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite configurations under concurrent load")
+    parser.add_argument("--db", default=DB_PATH, help=f"Source database to copy (default: {DB_PATH})")
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent reader threads (default: 8)")
+    parser.add_argument("--writers", type=int, default=4, help="Concurrent writer threads (default: 4)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile (default: 5)")
+    parser.add_argument("--seed-rows", type=int, default=20000, help="Audit rows to seed (default: 20000)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file '{args.db}' not found!")
+        return False
+
+    profiles = [
+        ("default", False, False),
+        ("tuned", True, False),
+        ("tuned + writer queue", True, True),
+    ]
+
+    print(f"⚙️  {args.readers} readers, {args.writers} writers, {args.duration:.0f}s per profile")
+    print(f"\n{'Profile':<22} {'reads/s':>10} {'writes/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    print("-" * 70)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, tuned, use_writer_queue in profiles:
+            path = prepare_database(args.db, directory, tuned, args.seed_rows)
+            r = run_profile(path, tuned, use_writer_queue, args.readers, args.writers, args.duration)
+            print(f"{name:<22} {r['reads'] / args.duration:>10.0f} {r['writes'] / args.duration:>10.0f} "
+                  f"{r['read_p50_ms']:>8.2f} {r['read_p99_ms']:>8.2f} {r['errors']:>7}")
+            os.remove(path)
+
+    return True
+
+
+if __name__ == "__main__":
+    print("🏁 Health Admin SQLite Concurrency Benchmark")
+    print("=" * 70)
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Nightly AI insights batch job
+Runs AI analyses for every active patient through the API, skipping
+patients whose data has not changed since their last successful analysis,
+and checkpoints progress so an interrupted run resumes where it stopped
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+API_BASE_URL = "http://localhost:8000/api"
+CHECKPOINT_FILE = "nightly_insights_checkpoint.json"
+ANALYSIS_TIMEOUT = 300.0
+
+# Patient fields that feed the analysis prompt; a change to any of them
+# means the stored insight is stale
+FINGERPRINT_FIELDS = [
+    "allergies", "medical_conditions", "medications", "relationship_score",
+    "last_visit", "total_visits", "updated_at",
+]
+
+
+def patient_fingerprint(patient, analysis_type, additional_context):
+    """Hash the analysis inputs for a patient"""
+    inputs = {field: patient.get(field) for field in FINGERPRINT_FIELDS}
+    inputs["analysis_type"] = analysis_type
+    inputs["additional_context"] = additional_context
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def load_checkpoint(path):
+    """Load fingerprints of the last successful analysis per patient"""
+    if not os.path.exists(path):
+        return {"fingerprints": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, checkpoint):
+    """Atomically replace the checkpoint file"""
+    checkpoint["updated_at"] = datetime.now().isoformat()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class NightlyInsightsJob:
+    def __init__(self, client, headers, args):
+        self.client = client
+        self.headers = headers
+        self.args = args
+        self.semaphore = asyncio.Semaphore(args.concurrency)
+        self.checkpoint = load_checkpoint(args.checkpoint)
+        self.stats = {"analyzed": 0, "skipped": 0, "failed": 0}
+
+    async def analyze(self, patient, analysis_type):
+        """Run one analysis and record its fingerprint on success"""
+        key = f"{patient['id']}:{analysis_type}"
+        fingerprint = patient_fingerprint(patient, analysis_type, self.args.context)
+        if self.checkpoint["fingerprints"].get(key) == fingerprint:
+            self.stats["skipped"] += 1
+            return
+
+        analysis_data = {
+            "patient_id": patient["id"],
+            "analysis_type": analysis_type,
+            "additional_context": self.args.context,
+        }
+
+        async with self.semaphore:
+            try:
+                response = await self.client.post(
+                    f"{self.args.api_url}/patients/{patient['id']}/ai-analysis",
+                    json=analysis_data,
+                    headers=self.headers,
+                    timeout=ANALYSIS_TIMEOUT,
+                )
+            except httpx.HTTPError as e:
+                print(f"❌ Patient {patient['id']} ({analysis_type}): {e}")
+                self.stats["failed"] += 1
+                return
+
+        try:
+            success = response.status_code == 200 and response.json().get("success")
+        except (ValueError, AttributeError):
+            # Not a JSON object, e.g. an HTML error page from a proxy
+            success = False
+        if success:
+            self.checkpoint["fingerprints"][key] = fingerprint
+            self.stats["analyzed"] += 1
+        else:
+            # Fallback results are not recorded so the patient is retried next run
+            print(f"⚠️  Patient {patient['id']} ({analysis_type}): analysis failed ({response.status_code})")
+            self.stats["failed"] += 1
+
+    async def run(self, patients):
+        """Process patients in chunks, checkpointing after each chunk"""
+        chunk_size = self.args.chunk_size
+        for start in range(0, len(patients), chunk_size):
+            chunk = patients[start:start + chunk_size]
+            await asyncio.gather(*(
+                self.analyze(patient, analysis_type)
+                for patient in chunk
+                for analysis_type in self.args.analysis_types
+            ))
+            save_checkpoint(self.args.checkpoint, self.checkpoint)
+            print(f"📊 {min(start + chunk_size, len(patients))}/{len(patients)} patients processed "
+                  f"(analyzed {self.stats['analyzed']}, skipped {self.stats['skipped']}, "
+                  f"failed {self.stats['failed']})")
+
+
+async def main(args):
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=args.concurrency + 1)) as client:
+        try:
+            login_response = await client.post(
+                f"{args.api_url}/auth/login",
+                json={"username": args.username, "password": args.password},
+            )
+        except httpx.ConnectError:
+            print(f"❌ Cannot connect to {args.api_url} - make sure the server is running")
+            return False
+
+        if login_response.status_code != 200:
+            print(f"❌ Login failed: {login_response.status_code}")
+            return False
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        # GET /api/patients/ is not paginated yet (see user-001), so the whole
+        # list is fetched once; chunking below only bounds work per checkpoint
+        patients_response = await client.get(f"{args.api_url}/patients/", headers=headers)
+        if patients_response.status_code != 200:
+            print(f"❌ Failed to get patients: {patients_response.status_code}")
+            return False
+
+        patients = [p for p in patients_response.json() if p.get("is_active", True)]
+        print(f"👥 {len(patients)} active patients, analyses: {', '.join(args.analysis_types)}")
+
+        job = NightlyInsightsJob(client, headers, args)
+        started = time.monotonic()
+        await job.run(patients)
+
+    print(f"\n✅ Finished in {time.monotonic() - started:.1f}s - "
+          f"analyzed {job.stats['analyzed']}, skipped {job.stats['skipped']}, failed {job.stats['failed']}")
+    return job.stats["failed"] == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate AI insights for all active patients")
+    parser.add_argument("--api-url", default=API_BASE_URL, help=f"API base URL (default: {API_BASE_URL})")
+    parser.add_argument("--username", default=os.getenv("HEALTH_ADMIN_USERNAME", "admin"))
+    parser.add_argument("--password", default=os.getenv("HEALTH_ADMIN_PASSWORD", "admin123"))
+    parser.add_argument("--analysis-type", dest="analysis_types", action="append",
+                        help="Analysis type to run, may be repeated (default: relationship)")
+    parser.add_argument("--context", default="Nightly batch analysis", help="additional_context sent with each analysis")
+    parser.add_argument("--concurrency", type=int, default=2, help="Concurrent analyses (default: 2)")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Patients per checkpoint (default: 50)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE, help=f"Checkpoint file (default: {CHECKPOINT_FILE})")
+    args = parser.parse_args()
+    args.analysis_types = args.analysis_types or ["relationship"]
+
+    if args.concurrency < 1:
+        print("❌ --concurrency must be at least 1")
+        sys.exit(1)
+    if args.chunk_size < 1:
+        print("❌ --chunk-size must be at least 1")
+        sys.exit(1)
+
+    print("🌙 Health Admin - Nightly AI Insights")
+    print("=" * 40)
+    sys.exit(0 if asyncio.run(main(args)) else 1)
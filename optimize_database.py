@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Database index advisor
+Adds the secondary indexes used by the dashboard, billing and chat queries,
+optionally enables WAL journaling, and checks the query plans of those
+queries for remaining full table scans
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+
+# Same default as the backend when DATABASE_URL is not configured
+DEFAULT_DATABASE_URL = "sqlite:///./health_admin.db"
+
+# Below this many rows the planner may rightly prefer the primary key over
+# a secondary index, so a different plan is reported but not counted
+MIN_ROWS_FOR_PLAN = 1000
+
+# (index name, table, columns) - names follow SQLAlchemy's ix_<table>_<columns>
+INDEXES = [
+    ("ix_patient_interactions_patient_id_interaction_date", "patient_interactions", ["patient_id", "interaction_date"]),
+    ("ix_patient_interactions_interaction_date", "patient_interactions", ["interaction_date"]),
+    ("ix_audit_logs_timestamp", "audit_logs", ["timestamp"]),
+    ("ix_audit_logs_patient_id_timestamp", "audit_logs", ["patient_id", "timestamp"]),
+    ("ix_audit_logs_user_id_timestamp", "audit_logs", ["user_id", "timestamp"]),
+    ("ix_chat_messages_user_id_timestamp", "chat_messages", ["user_id", "timestamp"]),
+    ("ix_chat_messages_user_id_id", "chat_messages", ["user_id", "id"]),
+    ("ix_bills_patient_id_status", "bills", ["patient_id", "status"]),
+    ("ix_bills_status_due_date", "bills", ["status", "due_date"]),
+    ("ix_payments_bill_id", "payments", ["bill_id"]),
+    ("ix_ai_patient_insights_patient_id_generated_at", "ai_patient_insights", ["patient_id", "generated_at"]),
+    ("ix_conversation_exports_expires_at", "conversation_exports", ["expires_at"]),
+]
+
+# Representative queries behind /api/dashboard/*, /api/billing/* and /api/chat/history,
+# with the index each one is expected to use
+QUERIES = {
+    "dashboard: interactions today": (
+        "SELECT COUNT(*) FROM patient_interactions WHERE interaction_date >= ?",
+        ("2024-01-01",),
+        "ix_patient_interactions_interaction_date",
+    ),
+    "dashboard: recent activity": (
+        "SELECT * FROM audit_logs ORDER BY timestamp DESC LIMIT 10",
+        (),
+        "ix_audit_logs_timestamp",
+    ),
+    "patients: interaction history": (
+        "SELECT * FROM patient_interactions WHERE patient_id = ? ORDER BY interaction_date DESC",
+        (1,),
+        "ix_patient_interactions_patient_id_interaction_date",
+    ),
+    "patients: audit trail": (
+        "SELECT * FROM audit_logs WHERE patient_id = ? ORDER BY timestamp DESC",
+        (1,),
+        "ix_audit_logs_patient_id_timestamp",
+    ),
+    "users: audit trail": (
+        "SELECT * FROM audit_logs WHERE user_id = ? ORDER BY timestamp DESC",
+        (1,),
+        "ix_audit_logs_user_id_timestamp",
+    ),
+    "patients: active AI insights": (
+        "SELECT * FROM ai_patient_insights WHERE patient_id = ? AND is_active = 1 ORDER BY generated_at DESC",
+        (1,),
+        "ix_ai_patient_insights_patient_id_generated_at",
+    ),
+    "chat: history": (
+        "SELECT * FROM chat_messages WHERE user_id = ? ORDER BY timestamp",
+        (1,),
+        "ix_chat_messages_user_id_timestamp",
+    ),
+    "chat: history page": (
+        "SELECT * FROM chat_messages WHERE user_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+        (1, 1000, 50),
+        "ix_chat_messages_user_id_id",
+    ),
+    "billing: patient bills": (
+        "SELECT * FROM bills WHERE patient_id = ? AND status = ?",
+        (1, "pending"),
+        "ix_bills_patient_id_status",
+    ),
+    "billing: overdue bills": (
+        "SELECT * FROM bills WHERE status = ? AND due_date < ?",
+        ("pending", "2024-01-01"),
+        "ix_bills_status_due_date",
+    ),
+    "billing: bill payments": (
+        "SELECT * FROM payments WHERE bill_id = ?",
+        (1,),
+        "ix_payments_bill_id",
+    ),
+    "exports: expired": (
+        "SELECT id, export_id, file_path, expires_at FROM conversation_exports "
+        "WHERE expires_at < ? AND (expires_at, id) > (?, ?) ORDER BY expires_at, id LIMIT ?",
+        ("2024-01-01", "", 0, 500),
+        "ix_conversation_exports_expires_at",
+    ),
+}
+
+
+def get_database_url():
+    """Return DATABASE_URL from the environment or .env, as the backend reads it"""
+    if os.getenv("DATABASE_URL"):
+        return os.getenv("DATABASE_URL")
+    if os.path.exists(".env"):
+        with open(".env", "r") as f:
+            for line in f:
+                key, _, value = line.strip().partition("=")
+                if key.strip() == "DATABASE_URL" and value.strip():
+                    return value.strip().strip("'\"")
+    return DEFAULT_DATABASE_URL
+
+
+def sqlite_path_from_url(url):
+    """Return the file path of a sqlite:/// URL, or None for any other database"""
+    match = re.match(r"^sqlite(\+\w+)?:///(.+)$", url)
+    if not match or match.group(2).startswith(":memory:"):
+        return None
+    return match.group(2).split("?")[0]
+
+
+def get_existing_indexes(cursor):
+    """Return the names of all indexes in the database"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def get_tables(cursor):
+    """Return the names of all tables in the database"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_indexes(conn):
+    """Create any missing indexes and refresh planner statistics"""
+    cursor = conn.cursor()
+    tables = get_tables(cursor)
+    existing = get_existing_indexes(cursor)
+    created = 0
+
+    for name, table, columns in INDEXES:
+        if table not in tables:
+            print(f"⚠️  Skipping {name}: table '{table}' not found")
+            continue
+        if name in existing:
+            continue
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+        print(f"✅ Created index {name}")
+        created += 1
+
+    cursor.execute("ANALYZE")
+    conn.commit()
+
+    if created == 0:
+        print("✅ All recommended indexes already present")
+    return created
+
+
+def check_query_plans(conn):
+    """Run EXPLAIN QUERY PLAN for each query and flag scans or unexpected index choices"""
+    cursor = conn.cursor()
+    tables = get_tables(cursor)
+    problems = 0
+    inconclusive = 0
+
+    for label, (sql, params, expected_index) in QUERIES.items():
+        table = sql.split(" FROM ")[1].split()[0]
+        if table not in tables:
+            print(f"⚠️  {label}: table '{table}' not found")
+            continue
+
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        details = [row[-1] for row in cursor.fetchall()]
+
+        # "SCAN <table>" without an index is a full table scan; a temp b-tree
+        # means the ORDER BY could not be served from an index
+        scans = [d for d in details if d.startswith("SCAN") and "USING" not in d]
+        sorts = [d for d in details if "TEMP B-TREE" in d]
+        # A rowid range search or a different index can also read far more
+        # rows than needed, so require the index the query was designed for
+        uses_expected = any(re.search(rf"INDEX {expected_index}\b", d) for d in details)
+
+        if scans or sorts or not uses_expected:
+            row_count = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            if row_count < MIN_ROWS_FOR_PLAN:
+                inconclusive += 1
+                print(f"⚠️  {label} (expected {expected_index}; only {row_count} rows, plan not conclusive)")
+            else:
+                problems += 1
+                print(f"❌ {label} (expected {expected_index})")
+        else:
+            print(f"✅ {label}")
+        for detail in details:
+            print(f"     {detail}")
+
+    return problems, inconclusive
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and apply recommended database indexes")
+    parser.add_argument("--db", help="SQLite database path (default: taken from DATABASE_URL)")
+    parser.add_argument("--apply", action="store_true", help="Create missing indexes before checking")
+    parser.add_argument("--wal", action="store_true",
+                        help="Switch the database to WAL journaling (persists for every connection)")
+    args = parser.parse_args()
+
+    if args.db is None:
+        database_url = get_database_url()
+        args.db = sqlite_path_from_url(database_url)
+        if args.db is None:
+            # The indexes must reach the database the server actually uses;
+            # checking a local file instead would report a misleading result
+            print(f"❌ DATABASE_URL '{database_url.split('@')[-1]}' is not a SQLite database.")
+            print("   This tool only supports SQLite; create the indexes on other")
+            print("   databases with your migration tooling.")
+            return False
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file '{args.db}' not found!")
+        return False
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.wal:
+            mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            print(f"✅ Journal mode: {mode}")
+        if args.apply:
+            print("🔧 Applying recommended indexes...")
+            apply_indexes(conn)
+        else:
+            missing = [name for name, _, _ in INDEXES if name not in get_existing_indexes(conn.cursor())]
+            if missing:
+                print(f"⚠️  Missing indexes: {missing}")
+                print("   Run with --apply to create them.")
+
+        print("\n🔍 Checking query plans...")
+        problems, inconclusive = check_query_plans(conn)
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 40)
+    if problems:
+        print(f"⚠️  {problems} queries do not use their expected index")
+        return False
+    if inconclusive:
+        print(f"✅ No problems found; {inconclusive} queries run on tables too small to judge")
+        return True
+    print("🎉 All checked queries use their expected index")
+    return True
+
+
+if __name__ == "__main__":
+    print("🔍 Health Admin Database Index Advisor")
+    print("=" * 40)
+    sys.exit(0 if main() else 1)
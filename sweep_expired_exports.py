@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Expired conversation export sweeper
+Deletes export files and conversation_exports rows past their expires_at
+in batches and reports export disk usage
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+DB_PATH = "health_admin.db"
+STORAGE_PATH = os.getenv("EXPORT_STORAGE_PATH", "./exports")
+# Relative export paths are written relative to the app, not the caller's cwd
+APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+BATCH_SIZE = 500
+
+
+def directory_size(path):
+    """Return the total size in bytes of all files under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def is_within(path, directory):
+    """Check that path resolves to a location inside directory"""
+    directory = os.path.realpath(directory)
+    try:
+        return os.path.commonpath([os.path.realpath(path), directory]) == directory
+    except ValueError:
+        # Paths on different drives (Windows) have no common path
+        return False
+
+
+def resolve_export_path(file_path, storage_dir):
+    """Return the on-disk path of an export, or None if the file is missing"""
+    if os.path.isabs(file_path):
+        candidates = [file_path]
+    else:
+        # Stored either relative to the app ("./exports/x.pdf") or as a bare
+        # name inside the storage directory
+        candidates = [os.path.join(APP_ROOT, file_path), os.path.join(storage_dir, file_path)]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def sweep(conn, storage_dir, batch_size, dry_run=False):
+    """Delete expired exports batch by batch and return (rows, bytes, missing files)"""
+    cursor = conn.cursor()
+    if not dry_run:
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_conversation_exports_expires_at "
+                       "ON conversation_exports (expires_at)")
+        conn.commit()
+
+    # expires_at may have been written in local time or UTC; using the earlier
+    # of the two never removes an export before it has expired
+    utc_now = datetime.now(timezone.utc).replace(tzinfo=None)
+    now = min(datetime.now(), utc_now).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    deleted_rows = 0
+    reclaimed_bytes = 0
+    missing_files = 0
+    last_expires_at, last_id = "", 0
+
+    while True:
+        # Page on (expires_at, id) so each batch is a range read of the
+        # expires_at index; skipped rows stay behind the cursor
+        cursor.execute(
+            "SELECT id, export_id, file_path, expires_at FROM conversation_exports "
+            "WHERE expires_at < ? AND (expires_at, id) > (?, ?) "
+            "ORDER BY expires_at, id LIMIT ?",
+            (now, last_expires_at, last_id, batch_size),
+        )
+        batch = cursor.fetchall()
+        if not batch:
+            break
+        last_id, last_expires_at = batch[-1][0], batch[-1][3]
+
+        expired_ids = []
+        for row_id, export_id, stored_path, _ in batch:
+            file_path = resolve_export_path(stored_path, storage_dir) if stored_path else None
+            if stored_path and file_path is None:
+                # Already gone, e.g. removed by hand; the row is still dropped
+                print(f"⚠️  Export {export_id}: {stored_path} not found, removing its row only")
+                missing_files += 1
+            elif file_path:
+                if not is_within(file_path, storage_dir):
+                    # Never delete files outside the export storage; leave the
+                    # row in place so the file can still be found and handled
+                    print(f"⚠️  Export {export_id}: {file_path} is outside {storage_dir}, skipped")
+                    continue
+                try:
+                    size = os.path.getsize(file_path)
+                    if not dry_run:
+                        os.remove(file_path)
+                except OSError as e:
+                    # e.g. a file still open elsewhere on Windows; retry next sweep
+                    print(f"⚠️  Export {export_id}: could not delete {file_path}: {e}")
+                    continue
+                reclaimed_bytes += size
+            expired_ids.append(row_id)
+
+        if not dry_run and expired_ids:
+            cursor.executemany("DELETE FROM conversation_exports WHERE id = ?",
+                               [(row_id,) for row_id in expired_ids])
+            conn.commit()
+        deleted_rows += len(expired_ids)
+
+    return deleted_rows, reclaimed_bytes, missing_files
+
+
+def collect_metrics(conn, storage_dir):
+    """Return export row/byte totals and on-disk usage of the storage directory"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*), COALESCE(SUM(file_size), 0) FROM conversation_exports")
+    export_rows, export_bytes = cursor.fetchone()
+    return {
+        "export_rows": export_rows,
+        "export_bytes": export_bytes,
+        "storage_dir_bytes": directory_size(storage_dir),
+    }
+
+
+def run_once(args):
+    """Run a single sweep and print/write the resulting metrics"""
+    conn = sqlite3.connect(args.db)
+    try:
+        started = time.monotonic()
+        deleted_rows, reclaimed_bytes, missing_files = sweep(conn, args.storage_dir, args.batch_size, args.dry_run)
+        metrics = collect_metrics(conn, args.storage_dir)
+    except (sqlite3.Error, OSError) as e:
+        print(f"❌ Error sweeping exports: {e}")
+        return False
+    finally:
+        conn.close()
+
+    metrics.update({
+        "timestamp": datetime.now().isoformat(),
+        "deleted_rows": deleted_rows,
+        "reclaimed_bytes": reclaimed_bytes,
+        "missing_files": missing_files,
+        "sweep_seconds": round(time.monotonic() - started, 3),
+        "dry_run": args.dry_run,
+    })
+
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(f"🧹 {verb} {deleted_rows} expired exports, {reclaimed_bytes / 1024 / 1024:.2f} MB reclaimed")
+    if missing_files:
+        print(f"⚠️  {missing_files} expired exports had no file on disk")
+    print(f"📊 {metrics['export_rows']} exports tracked ({metrics['export_bytes'] / 1024 / 1024:.2f} MB), "
+          f"{metrics['storage_dir_bytes'] / 1024 / 1024:.2f} MB on disk in {args.storage_dir}")
+
+    if args.metrics_file:
+        tmp_path = args.metrics_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(metrics, f, indent=2)
+        os.replace(tmp_path, args.metrics_file)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete expired conversation exports")
+    parser.add_argument("--db", default=DB_PATH, help=f"SQLite database path (default: {DB_PATH})")
+    parser.add_argument("--storage-dir", default=os.path.normpath(os.path.join(APP_ROOT, STORAGE_PATH)),
+                        help=f"Export storage directory (default: $EXPORT_STORAGE_PATH or {STORAGE_PATH}, "
+                             "relative to the app)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"Rows per batch (default: {BATCH_SIZE})")
+    parser.add_argument("--interval", type=int, default=0,
+                        help="Repeat every N seconds instead of running once")
+    parser.add_argument("--metrics-file", help="Write disk-usage metrics as JSON to this file")
+    parser.add_argument("--dry-run", action="store_true", help="Report without deleting anything")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file '{args.db}' not found!")
+        return False
+    if args.batch_size < 1:
+        print("❌ --batch-size must be at least 1")
+        return False
+
+    if args.interval <= 0:
+        return run_once(args)
+
+    print(f"⏰ Sweeping every {args.interval}s (Ctrl+C to stop)")
+    try:
+        while True:
+            run_once(args)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("🛑 Sweeper stopped")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
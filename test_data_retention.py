@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test script for the data retention jobs
+Seeds a temporary copy of health_admin.db and checks that the audit log
+archiver moves old rows into archive files, deletes them from the hot
+table and finds them again on lookup, and that the export sweeper only
+removes expired exports inside the storage directory
+"""
+
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+import archive_audit_logs
+import sweep_expired_exports
+
+DB_PATH = "health_admin.db"
+PATIENT_ID = 1
+OTHER_PATIENT_ID = 2
+
+
+def make_test_db(workdir):
+    """Copy health_admin.db into workdir and return a connection with empty test tables"""
+    db_path = os.path.join(workdir, "health_admin.db")
+    shutil.copyfile(DB_PATH, db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM audit_logs")
+    conn.execute("DELETE FROM conversation_exports")
+    conn.commit()
+    return conn
+
+
+def seed_audit_logs(conn):
+    """Insert audit rows in two old months and the current month"""
+    recent = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+    rows = [
+        (PATIENT_ID, "view", "2020-01-05 09:00:00.000000"),
+        (OTHER_PATIENT_ID, "view", "2020-01-20 10:30:00.000000"),
+        (PATIENT_ID, "update", "2020-02-11 14:00:00.000000"),
+        (PATIENT_ID, "view", recent),
+    ]
+    conn.executemany(
+        "INSERT INTO audit_logs (user_id, patient_id, action, resource, details, timestamp) "
+        "VALUES (1, ?, ?, 'patient', ?, ?)",
+        [(patient_id, action, json.dumps({"note": action}), timestamp)
+         for patient_id, action, timestamp in rows],
+    )
+    conn.commit()
+    return rows
+
+
+def test_archive_audit_logs():
+    """Archive old months, then check files, index, hot table and lookup"""
+    workdir = tempfile.mkdtemp()
+    try:
+        conn = make_test_db(workdir)
+        archive_dir = os.path.join(workdir, "archives")
+        seed_audit_logs(conn)
+
+        # Step 1: Dry run changes nothing
+        print("1. Dry run...")
+        assert archive_audit_logs.archive(conn, archive_dir, 6, dry_run=True) == 0
+        assert conn.execute("SELECT COUNT(*) FROM audit_logs").fetchone()[0] == 4
+        print("✅ Dry run left the table untouched")
+
+        # Step 2: Archive the two old months
+        print("\n2. Archiving...")
+        assert archive_audit_logs.archive(conn, archive_dir, 6) == 3
+        index = archive_audit_logs.load_index(archive_dir)
+        assert [entry["month"] for entry in index["files"]] == ["2020-01", "2020-02"]
+        assert [entry["rows"] for entry in index["files"]] == [2, 1]
+        assert index["files"][0]["patient_ids"] == [PATIENT_ID, OTHER_PATIENT_ID]
+        for entry in index["files"]:
+            with gzip.open(os.path.join(archive_dir, entry["file"]), "rt", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+            assert len(records) == entry["rows"]
+            assert all(record["timestamp"].startswith(entry["month"]) for record in records)
+        print(f"✅ Archived 3 rows into {len(index['files'])} files")
+
+        # Step 3: Archived rows are gone from the hot table
+        print("\n3. Checking the hot table...")
+        remaining = conn.execute("SELECT timestamp FROM audit_logs").fetchall()
+        assert len(remaining) == 1 and not remaining[0][0].startswith("2020")
+        print("✅ Only the current month is left")
+
+        # Step 4: A second run has nothing to do
+        print("\n4. Re-running...")
+        assert archive_audit_logs.archive(conn, archive_dir, 6) == 0
+        assert len(archive_audit_logs.load_index(archive_dir)["files"]) == 2
+        print("✅ Nothing archived twice")
+
+        # Step 5: Lookup combines archives and the hot table
+        print("\n5. Looking up patient entries...")
+        records = list(archive_audit_logs.lookup(conn, archive_dir, PATIENT_ID,
+                                                 "0000-01-01", "9999-12-31"))
+        assert [record["action"] for record in records] == ["view", "update", "view"]
+        assert records[0]["details"] == {"note": "view"}
+        records = list(archive_audit_logs.lookup(conn, archive_dir, PATIENT_ID,
+                                                 "2020-02-01", "2020-02-29 23:59:59"))
+        assert [record["action"] for record in records] == ["update"]
+        print("✅ Lookup returned archived and current entries")
+        conn.close()
+    finally:
+        shutil.rmtree(workdir)
+
+
+def seed_exports(conn, storage_dir, outside_dir):
+    """Insert expired and current exports and create their files"""
+    def write_file(path):
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+        return path
+
+    exports = [
+        ("expired-absolute", write_file(os.path.join(storage_dir, "a.pdf")), "2020-01-01 00:00:00.000000"),
+        ("expired-relative", os.path.basename(write_file(os.path.join(storage_dir, "b.pdf"))),
+         "2020-01-02 00:00:00.000000"),
+        ("expired-missing", os.path.join(storage_dir, "gone.pdf"), "2020-01-03 00:00:00.000000"),
+        ("expired-outside", write_file(os.path.join(outside_dir, "c.pdf")), "2020-01-04 00:00:00.000000"),
+        ("expired-no-file", None, "2020-01-05 00:00:00.000000"),
+        ("current", write_file(os.path.join(storage_dir, "d.pdf")), "9999-01-01 00:00:00.000000"),
+    ]
+    conn.executemany(
+        "INSERT INTO conversation_exports (export_id, user_id, file_path, file_size, expires_at) "
+        "VALUES (?, 1, ?, 100, ?)",
+        exports,
+    )
+    conn.commit()
+
+
+def test_sweep_expired_exports():
+    """Sweep expired exports, then check deleted rows and files"""
+    workdir = tempfile.mkdtemp()
+    try:
+        conn = make_test_db(workdir)
+        storage_dir = os.path.join(workdir, "exports")
+        outside_dir = os.path.join(workdir, "elsewhere")
+        os.makedirs(storage_dir)
+        os.makedirs(outside_dir)
+        seed_exports(conn, storage_dir, outside_dir)
+
+        # Step 1: Dry run deletes nothing
+        print("1. Dry run...")
+        assert sweep_expired_exports.sweep(conn, storage_dir, 2, dry_run=True) == (4, 200, 1)
+        assert conn.execute("SELECT COUNT(*) FROM conversation_exports").fetchone()[0] == 6
+        assert sorted(os.listdir(storage_dir)) == ["a.pdf", "b.pdf", "d.pdf"]
+        print("✅ Dry run left rows and files untouched")
+
+        # Step 2: Sweep in batches smaller than the number of expired rows
+        print("\n2. Sweeping...")
+        assert sweep_expired_exports.sweep(conn, storage_dir, 2) == (4, 200, 1)
+        remaining = [row[0] for row in conn.execute(
+            "SELECT export_id FROM conversation_exports ORDER BY export_id")]
+        assert remaining == ["current", "expired-outside"]
+        assert os.listdir(storage_dir) == ["d.pdf"]
+        assert os.listdir(outside_dir) == ["c.pdf"]
+        print("✅ Expired exports removed, current and outside files kept")
+
+        # Step 3: A second sweep only revisits the skipped outside export
+        print("\n3. Re-sweeping...")
+        assert sweep_expired_exports.sweep(conn, storage_dir, 2) == (0, 0, 0)
+        print("✅ Nothing left to sweep")
+        conn.close()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    print("🏥 Health Administrative Tool - Data Retention Test")
+    print("=" * 60)
+
+    if not os.path.exists(DB_PATH):
+        print(f"❌ Database file '{DB_PATH}' not found!")
+        sys.exit(1)
+
+    try:
+        test_archive_audit_logs()
+    except AssertionError:
+        print("❌ Audit log archive test failed")
+        raise
+
+    print("\n" + "=" * 60)
+    try:
+        test_sweep_expired_exports()
+    except AssertionError:
+        print("❌ Export sweep test failed")
+        raise
+
+    print("\n🎉 All data retention tests passed!")